@@ -0,0 +1,5 @@
+"""MarkTidy: markdown cleanup helpers for the Streamlit app."""
+
+from marktidy.transforms import process_markdown
+
+__all__ = ["process_markdown"]
@@ -0,0 +1,483 @@
+"""Markdown cleanup and restructuring transforms used by the MarkTidy app."""
+
+import functools
+import re
+from collections.abc import Iterable, Iterator
+
+# --- Regex Patterns ---
+# Compiled once at import so that every Streamlit rerun reuses them
+_HEADING_RE = re.compile(r"^(#+)(\s*)(.*)")
+_LEADING_NUM_RE = re.compile(r"^(\d+\.)+\s*")
+# Heading marker, then list marker, then blockquote marker at the line start
+_LEAD_RE = re.compile(
+    r"^(?P<heading>#+\s*)?"
+    r"(?P<list>\s*(?:[\*\-\+]|\d+\.)\s+)?"
+    r"(?P<quote>\s*>\s?)?"
+)
+_HR_RE = re.compile(r"^\s*([-*_]){3,}\s*$")
+_FIX_BOLD_RE = re.compile(r"\*\*(.+?)\*\*(\s*)")
+_SYMBOL_INNER_RE = re.compile(r"[^0-9A-Za-z\s]")
+_IMG_RE = re.compile(r"!\[([^\]]*)\]\([^)]+\)")
+_IMG_REMOVE_RE = re.compile(r"!\[.*?\]\([^)]+\)")
+_OBSIDIAN_IMG_RE = re.compile(r"!\[\[(.*?)\]\]")  # ![[filename.extension]]
+_LINK_RE = re.compile(r"\[([^\]]*)\]\([^)]+\)")
+_BOLD_RE = re.compile(r"\*\*(.*?)\*\*")
+_STRIKE_RE = re.compile(r"~~(.*?)~~")
+# Bold, italic, strikethrough, or inline code; exactly one group participates
+_INLINE_RE = re.compile(r"\*\*(.*?)\*\*|__(.*?)__|\*(.*?)\*|_(.*?)_|~~(.*?)~~|`(.*?)`")
+
+# Hash prefixes by count, so heading levels can change without "#" * n
+_HASHES = ("", "#", "##", "###", "####", "#####", "######")
+
+# --- Helper Functions ---
+
+
+def shift_headings(lines: list[str], delta: int) -> list[str]:
+    """
+    Adjusts the level of markdown headings up or down.
+
+    Args:
+        lines: Markdown text lines
+        delta: Number of levels to shift by; positive increases the level
+
+    Returns:
+        Lines with adjusted heading levels
+    """
+    new_lines = []
+    for line in lines:
+        # Headings start with '#' in the first column; leave other lines as-is
+        if not line.startswith("#"):
+            new_lines.append(line)
+            continue
+
+        level = len(line) - len(line.lstrip("#"))
+        # Ensure heading level stays within valid range (1-6)
+        if delta > 0:
+            new_level = max(level, min(6, level + delta))
+        else:
+            new_level = max(1, level + delta)
+
+        # Add or drop leading hashes instead of rebuilding the line
+        if new_level > level:
+            line = _HASHES[new_level - level] + line
+        elif new_level < level:
+            line = line[level - new_level :]
+        new_lines.append(line)
+    return new_lines
+
+
+def fix_bold_symbol_issue(lines: list[str]) -> list[str]:
+    """
+    Fixes markdown bold formatting issues by ensuring proper spacing.
+
+    Args:
+        lines: Markdown text lines
+
+    Returns:
+        Lines with corrected bold symbol spacing
+    """
+
+    def repl(m):
+        inner = m.group(1)
+        after = m.group(2)
+        # Add space after ** if content contains symbols and text follows directly.
+        # The cheap checks run first so most matches skip the symbol search.
+        if not after and m.end() < len(m.string) and _SYMBOL_INNER_RE.search(inner):
+            return f"**{inner}** "
+        return m.group(0)
+
+    return [_FIX_BOLD_RE.sub(repl, line) if "**" in line else line for line in lines]
+
+
+def remove_paragraph(lines: list[str]) -> list[str]:
+    """
+    Removes paragraphs, blockquotes, and code blocks from markdown text.
+    It preserves headings, lists, horizontal rules, and blank lines.
+
+    Args:
+        lines: Markdown text lines.
+
+    Returns:
+        Lines with specified elements removed.
+    """
+    new_lines = []
+    in_code_block = False
+
+    for line in lines:
+        stripped_line = line.strip()
+
+        if stripped_line.startswith("```"):
+            in_code_block = not in_code_block
+            continue
+
+        if in_code_block:
+            continue
+
+        # Preserve headings, lists, horizontal rules, and blank lines.
+        # Cheap prefix checks run first so plain paragraphs skip the regexes.
+        if (
+            not stripped_line
+            or stripped_line.startswith(("#", "- ", "* "))
+            or is_ordered_list_item(stripped_line)
+            or (stripped_line[0] in "-*_" and _HR_RE.match(stripped_line))
+        ):
+            new_lines.append(line)
+
+    return new_lines
+
+
+def number_headings(lines: list[str]) -> list[str]:
+    """
+    Automatically numbers markdown headings hierarchically.
+    H1 headings are preserved without numbers, numbering starts from H2.
+
+    Args:
+        lines: Markdown text lines
+
+    Returns:
+        Lines with numbered headings
+    """
+    new_lines = []
+
+    # Initialize counters for heading levels H2-H6, along with their string
+    # forms ("" while unset) so numbers are only stringified when they change
+    counters = [0] * 5
+    counter_strs = [""] * 5
+    in_code_block = False
+
+    for line in lines:
+        stripped_line = line.strip()
+
+        # Handle code block boundaries
+        if stripped_line.startswith("```"):
+            in_code_block = not in_code_block
+            new_lines.append(line)
+            continue
+
+        # Skip processing within code blocks
+        if in_code_block:
+            new_lines.append(line)
+            continue
+
+        # Process headings, skipping the regex for lines that cannot match
+        match = _HEADING_RE.match(line) if line.startswith("#") else None
+        if match:
+            hashes, space, content = match.groups()
+            level = len(hashes)
+
+            if level == 1:
+                # Reset counters for H1 and keep unchanged
+                counters = [0] * 5
+                counter_strs = [""] * 5
+                new_lines.append(line)
+                continue
+
+            if 2 <= level <= 6:
+                # Reset lower level counters
+                for i in range(level - 1, 5):
+                    counters[i] = 0
+                    counter_strs[i] = ""
+
+                # Increment current level counter
+                counters[level - 2] += 1
+                counter_strs[level - 2] = str(counters[level - 2])
+
+                # Generate heading number
+                number_parts = [c for c in counter_strs[: level - 1] if c]
+                number_prefix = ".".join(number_parts) + "."
+
+                # Apply new heading format, reusing the matched hashes
+                content_clean = _LEADING_NUM_RE.sub("", content.strip())
+                new_line = f"{hashes}{space}{number_prefix} {content_clean.strip()}"
+                new_lines.append(new_line)
+            else:
+                new_lines.append(line)
+        else:
+            new_lines.append(line)
+
+    return new_lines
+
+
+def is_ordered_list_item(stripped_line: str) -> bool:
+    """
+    Checks whether a line starts with an ordered list marker such as '1. '.
+    Uses string methods rather than a regular expression.
+
+    Args:
+        stripped_line: A single line of markdown text with whitespace stripped
+
+    Returns:
+        True if the line starts with digits, a period, and whitespace
+    """
+    if not stripped_line[:1].isdecimal():
+        return False
+    number, dot, rest = stripped_line.partition(".")
+    return bool(dot) and number.isdecimal() and rest[:1].isspace()
+
+
+def is_list_item(stripped_line: str) -> bool:
+    """
+    Checks whether a line is a bullet or ordered list item.
+
+    Args:
+        stripped_line: A single line of markdown text with whitespace stripped
+
+    Returns:
+        True if the line starts with a list marker
+    """
+    return stripped_line.startswith(("- ", "* ")) or is_ordered_list_item(stripped_line)
+
+
+def remove_blank_lines_between_list_items(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Removes empty lines between list items while preserving other blank lines.
+    Lines are streamed in a single pass, holding back at most one blank line
+    until the following line shows whether it sits between list items.
+
+    Args:
+        lines: Markdown text lines
+
+    Yields:
+        Lines with unnecessary blank lines removed
+    """
+    prev_is_list_item = False
+    pending_blank = None
+
+    for line in lines:
+        stripped_line = line.strip()
+        current_is_list_item = is_list_item(stripped_line)
+
+        # Skip the held blank line only if it sits between list items
+        if pending_blank is not None:
+            if not current_is_list_item:
+                yield pending_blank
+            pending_blank = None
+
+        if not stripped_line and prev_is_list_item:
+            pending_blank = line
+        else:
+            yield line
+
+        prev_is_list_item = current_is_list_item
+
+    if pending_blank is not None:
+        yield pending_blank
+
+
+def _strip_inline_format(m: re.Match) -> str:
+    """Returns the content of an inline format match, itself unformatted."""
+    return _INLINE_RE.sub(_strip_inline_format, m.group(m.lastindex))
+
+
+def clear_markdown_format(lines: list[str]) -> list[str]:
+    """
+    Removes all common markdown formatting from the text.
+
+    Args:
+        lines: Markdown text lines.
+
+    Returns:
+        Lines with markdown formatting removed.
+    """
+    new_lines = []
+    for line in lines:
+        # 1-2. Remove images and links, keeping alt and link text
+        if "](" in line:
+            line = _IMG_RE.sub(r"\1", line)
+            line = _LINK_RE.sub(r"\1", line)
+        # 3. Remove bold, italic, strikethrough, and inline code
+        # Repeat until stable, so triple markers such as ***text*** lose both
+        # their bold and italic layers
+        while True:
+            cleared = _INLINE_RE.sub(_strip_inline_format, line)
+            if cleared == line:
+                break
+            line = cleared
+        # 4. Remove heading, list, and blockquote markers
+        line = _LEAD_RE.sub("", line, count=1)
+        # 5. Remove horizontal rules
+        if _HR_RE.match(line):
+            continue
+        new_lines.append(line)
+
+    return new_lines
+
+
+def extract_headings(lines: list[str]) -> list[str]:
+    """
+    Extracts only the heading lines from markdown text.
+
+    Args:
+        lines: Markdown text lines.
+
+    Returns:
+        Only the heading lines.
+    """
+    heading_lines = []
+    in_code_block = False
+
+    for line in lines:
+        stripped_line = line.strip()
+
+        if stripped_line.startswith("```"):
+            in_code_block = not in_code_block
+            continue
+
+        if in_code_block:
+            continue
+
+        # Preserve headings
+        if stripped_line.startswith("#"):
+            heading_lines.append(line)
+
+    return heading_lines
+
+
+def fix_image_links_issue(lines: list[str]) -> list[str]:
+    """
+    Converts Obsidian-style image links to standard markdown links.
+    Example: ![[image.png]] -> ![image.png](./image.png)
+    Also, replaces spaces in the filename with %20.
+
+    Args:
+        lines: Markdown text lines.
+
+    Returns:
+        Lines with corrected image links.
+    """
+
+    # Replacement function
+    def repl(m):
+        filename = m.group(1)
+        # URL encode spaces
+        encoded_filename = filename.replace(" ", "%20")
+        # Use filename as alt text and create a relative path
+        return f"![{filename}](./{encoded_filename})"
+
+    return [
+        _OBSIDIAN_IMG_RE.sub(repl, line) if "![[" in line else line for line in lines
+    ]
+
+
+# --- Processing Pipeline ---
+
+
+@functools.lru_cache(maxsize=None)
+def get_line_transforms(
+    remove_bold: bool,
+    remove_links: bool,
+    remove_images: bool,
+    modify_strikethrough: bool,
+) -> tuple[tuple[str, re.Pattern, str], ...]:
+    """
+    Builds the per-line substitutions for the selected cleanup operations.
+    There are only 16 flag combinations, so each is built once and reused.
+    Each substitution carries a marker substring that any match must contain,
+    so lines without it can skip the regex.
+
+    Args:
+        remove_bold: Remove bold formatting
+        remove_links: Replace links with their text
+        remove_images: Remove images
+        modify_strikethrough: Convert ~~text~~ to ~text~
+
+    Returns:
+        Tuple of (marker, pattern, replacement) triples in application order
+    """
+    line_transforms = []
+    if remove_bold:
+        line_transforms.append(("**", _BOLD_RE, r"\1"))
+    if remove_links:
+        line_transforms.append(("](", _LINK_RE, r"\1"))
+    if remove_images:
+        line_transforms.append(("![", _IMG_REMOVE_RE, ""))
+    if modify_strikethrough:
+        line_transforms.append(("~~", _STRIKE_RE, r"~\1~"))
+    return tuple(line_transforms)
+
+
+def process_markdown(
+    input_text: str,
+    *,
+    fix_bold_symbols: bool,
+    remove_bold: bool,
+    modify_strikethrough: bool,
+    clear_formatting: bool,
+    remove_links: bool,
+    remove_images: bool,
+    fix_image_links: bool,
+    remove_blank_lines: bool,
+    extract_heading: bool,
+    remove_horizontal: bool,
+    remove_plain_text: bool,
+    auto_number_headings: bool,
+    heading_shift: int,
+) -> str:
+    """
+    Applies the selected cleanup and structure operations to markdown text.
+
+    Args:
+        input_text: Input markdown text
+        heading_shift: Number of levels to shift headings by (-3 to 3)
+        Remaining keyword arguments mirror the sidebar options
+
+    Returns:
+        Processed markdown text
+    """
+    # isspace() avoids building a stripped copy of the whole document
+    if not input_text or input_text.isspace():
+        return input_text
+
+    # Keep the text as a list of lines for every stage and join it once at the end
+    lines = input_text.splitlines()
+
+    if extract_heading:
+        lines = extract_headings(lines)
+        if not lines:
+            return ""
+        # Only heading lines remain, so there are no blank lines, list items,
+        # horizontal rules, or code blocks left for these options to change
+        remove_blank_lines = remove_horizontal = remove_plain_text = False
+
+    # Look up the per-line substitutions for the selected cleanup operations
+    line_transforms = get_line_transforms(
+        remove_bold, remove_links, remove_images, modify_strikethrough
+    )
+
+    # Apply them and horizontal rule removal in a single pass over the lines
+    if remove_blank_lines:
+        lines = remove_blank_lines_between_list_items(lines)
+
+    new_lines = []
+    for line in lines:
+        for marker, pattern, repl in line_transforms:
+            if marker in line:
+                line = pattern.sub(repl, line)
+        if remove_horizontal and _HR_RE.match(line):
+            line = ""
+        new_lines.append(line)
+    lines = new_lines
+
+    # Apply formatting fixes
+    if fix_bold_symbols:
+        lines = fix_bold_symbol_issue(lines)
+
+    if fix_image_links:
+        lines = fix_image_links_issue(lines)
+
+    # Apply heading modifications
+    if heading_shift != 0:
+        lines = shift_headings(lines, heading_shift)
+
+    if remove_plain_text:
+        lines = remove_paragraph(lines)
+
+    # Apply heading numbers last to ensure correct numbering
+    if auto_number_headings:
+        lines = number_headings(lines)
+
+    if clear_formatting:
+        # Clear all other formatting if this option is selected
+        lines = clear_markdown_format(lines)
+
+    return "\n".join(lines)
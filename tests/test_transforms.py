@@ -0,0 +1,47 @@
+import unittest
+
+from marktidy.transforms import clear_markdown_format, fix_bold_symbol_issue
+
+
+class ClearMarkdownFormatTest(unittest.TestCase):
+    def test_removes_nested_and_triple_markers(self):
+        # Expected values match the output of the original sequential passes
+        cases = {
+            "***bold italic***": "bold italic",
+            "___x___": "x",
+            "**a _b_ c**": "a b c",
+            "~~**s**~~": "s",
+            "plain *it* and `code`": "plain it and code",
+            "# ***Title*** here": "Title here",
+            "- __bold__ and _it_": "bold and it",
+        }
+        for line, expected in cases.items():
+            with self.subTest(line=line):
+                self.assertEqual(clear_markdown_format([line]), [expected])
+
+    def test_removes_links_images_and_rules(self):
+        lines = ["> [Link](https://example.com)", "![Image](image.jpg)", "---"]
+        self.assertEqual(clear_markdown_format(lines), ["Link", "Image"])
+
+
+class FixBoldSymbolIssueTest(unittest.TestCase):
+    def test_keeps_bold_spans_paired(self):
+        # Expected values match the output of the original implementation
+        cases = {
+            "**Apples**, **Pears**": "**Apples**, **Pears**",
+            "**Name** - **Bob**": "**Name** - **Bob**",
+            "**bold**:text **x!**y": "**bold**:text **x!** y",
+            "**Note:**see": "**Note:** see",
+            "**한글**다음 text": "**한글** 다음 text",
+        }
+        for line, expected in cases.items():
+            with self.subTest(line=line):
+                self.assertEqual(fix_bold_symbol_issue([line]), [expected])
+
+    def test_leaves_line_end_and_spaced_bold_unchanged(self):
+        lines = ["This is a **test!**", "**test!** next", "**plain**text"]
+        self.assertEqual(fix_bold_symbol_issue(lines), lines)
+
+
+if __name__ == "__main__":
+    unittest.main()